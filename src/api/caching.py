@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+
+from src.services.data_version_service import ALL_LOCATIONS, DataVersion, get_data_version
+
+
+# Bump whenever a deploy changes what a cached endpoint returns for the same
+# data, so clients holding a pre-deploy copy do not get a 304 for it
+REPRESENTATION_VERSION = 1
+
+# Last-Modified never predates this process, so If-Modified-Since clients
+# also revalidate after a deploy
+_STARTED_AT = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _make_etag(version_token: str) -> str:
+    # Weak validator: the same representation may be sent gzip/br encoded
+    return f'W/"v{REPRESENTATION_VERSION}-{version_token}"'
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return any(_strip_weak(tag) == _strip_weak(etag) for tag in candidates)
+
+
+def _not_modified_since(if_modified_since: str, last_modified) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since is None or since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _apply_validators(request: Request, response: Response, version: Optional[DataVersion]) -> None:
+    """Set ETag/Last-Modified and short-circuit with 304 when the client copy is current"""
+    if version is None:
+        return
+
+    version_token, last_modified = version
+    headers = {"ETag": _make_etag(version_token), "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        last_modified = max(last_modified.astimezone(timezone.utc), _STARTED_AT)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, headers["ETag"])
+    elif last_modified is not None and "if-modified-since" in request.headers:
+        not_modified = _not_modified_since(request.headers["if-modified-since"], last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def city_conditional_get(city: str, request: Request, response: Response) -> None:
+    """
+    Conditional GET for endpoints scoped to a single city.
+    Must be declared before any dependency that opens a database connection
+    so that a 304 is returned without touching the database.
+    """
+    _apply_validators(request, response, get_data_version(city))
+
+
+def cities_conditional_get(request: Request, response: Response) -> None:
+    """Conditional GET for endpoints that depend on the whole locations table"""
+    _apply_validators(request, response, get_data_version(ALL_LOCATIONS))
@@ -6,13 +6,19 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from fastapi import APIRouter, HTTPException, Depends, Query
 
-from src.database.db_initializer import initialize_database
-from src.database.connection import get_connection
-from src.services.weather_analytics_service import WeatherAnalytics  
+from src.api.caching import cities_conditional_get, city_conditional_get
+from src.database.connection import get_connection, is_database_ready
+from src.services.weather_analytics_service import (
+    AGGREGATE_BUCKETS,
+    AGGREGATE_PARAMETERS,
+    MAX_AGGREGATE_BUCKETS,
+    WeatherAnalytics,
+)
 from src.services.fire_danger_analytics_service import FireDangerAnalytics 
+from src.services.climatology_service import CLIMATOLOGY_PARAMETERS, ClimatologyAnalytics
+from src.services.location_index_service import get_location_index
 
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -44,7 +50,21 @@ async def health_check(conn = Depends(get_db)) -> Dict:
         raise HTTPException(status_code=500, detail="System unhealthy")
     
     
-@router.get("/cities")
+@router.get("/livez")
+async def liveness_check() -> Dict:
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+def readiness_check() -> Dict:
+    """Readiness probe: uses a cached database check instead of a new connection per probe"""
+    if not is_database_ready():
+        raise HTTPException(status_code=503, detail="Database not ready")
+    return {"status": "ready", "database": "connected"}
+
+
+@router.get("/cities", dependencies=[Depends(cities_conditional_get)])
 async def get_cities(conn = Depends(get_db)):
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -68,7 +88,7 @@ def get_analytics(conn = Depends(get_db)):
     return WeatherAnalytics(conn)
 
 
-@router.get("/weather/extremes/{city}/{parameter}")
+@router.get("/weather/extremes/{city}/{parameter}", dependencies=[Depends(city_conditional_get)])
 async def get_extremes(
     city: str, 
     parameter: str,
@@ -118,7 +138,7 @@ async def get_extremes(
         raise HTTPException(status_code=500, detail=str(e))
     
 
-@router.get("/weather/average/{city}/{parameter}")
+@router.get("/weather/average/{city}/{parameter}", dependencies=[Depends(city_conditional_get)])
 async def get_average(
     city: str, 
     parameter: str,
@@ -165,9 +185,73 @@ async def get_average(
     except Exception as e:
         logger.error(f"Error in get_average: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/weather/aggregate/{city}/{parameter}", dependencies=[Depends(city_conditional_get)])
+async def get_aggregates(
+    city: str,
+    parameter: str,
+    bucket: str = Query("month", description="One of: " + ", ".join(AGGREGATE_BUCKETS)),
+    start_date: Optional[str] = Query(None, description="Start date in YYYY-MM-DD format"),
+    end_date: Optional[str] = Query(None, description="End date in YYYY-MM-DD format"),
+    limit: int = Query(120, ge=1, le=MAX_AGGREGATE_BUCKETS, description="Maximum number of buckets to return"),
+    offset: int = Query(0, ge=0, description="Number of buckets to skip"),
+    analytics: WeatherAnalytics = Depends(get_analytics)
+) -> Dict:
+    try:
+        if parameter not in AGGREGATE_PARAMETERS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported parameter. Use one of: {', '.join(AGGREGATE_PARAMETERS)}"
+            )
+        if bucket not in AGGREGATE_BUCKETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported bucket. Use one of: {', '.join(AGGREGATE_BUCKETS)}"
+            )
+        if (start_date and not end_date) or (end_date and not start_date):
+            raise HTTPException(
+                status_code=400,
+                detail="Both start_date and end_date must be provided together"
+            )
+
+        if start_date and end_date:
+            if not analytics.validate_dates(start_date, end_date):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid date format or range. Use YYYY-MM-DD format and ensure start_date <= end_date"
+                )
+
+        result = analytics.get_aggregates(city, parameter, bucket, start_date, end_date, limit, offset)
+        if not result['buckets'] and offset == 0:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No data found for {city} {parameter} in specified date range"
+            )
+
+        response = {
+            "city": city,
+            "parameter": parameter,
+            **result
+        }
+        if start_date and end_date:
+            response.update({
+                "start_date": start_date,
+                "end_date": end_date
+            })
+        return response
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error(f"Database error in get_aggregates: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error in get_aggregates: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
     
-    
-@router.get("/cities")
+@router.get("/cities", dependencies=[Depends(cities_conditional_get)])
 async def get_cities(conn = Depends(get_db)):
     """Get list of available cities"""
     try:
@@ -188,11 +272,71 @@ async def get_cities(conn = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error occurred: {str(e)}")
     
 
+def get_climatology(conn = Depends(get_db)):
+    return ClimatologyAnalytics(conn)
+
+
+@router.get("/weather/anomalies/{city}/{parameter}", dependencies=[Depends(city_conditional_get)])
+async def get_anomalies(
+    city: str,
+    parameter: str,
+    start_date: Optional[str] = Query(None, description="Start date in YYYY-MM-DD format"),
+    end_date: Optional[str] = Query(None, description="End date in YYYY-MM-DD format"),
+    climatology: ClimatologyAnalytics = Depends(get_climatology)
+) -> Dict:
+    try:
+        if parameter not in CLIMATOLOGY_PARAMETERS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported parameter. Use one of: {', '.join(CLIMATOLOGY_PARAMETERS)}"
+            )
+        if (start_date and not end_date) or (end_date and not start_date):
+            raise HTTPException(
+                status_code=400,
+                detail="Both start_date and end_date must be provided together"
+            )
+
+        if start_date and end_date:
+            if not WeatherAnalytics.validate_dates(start_date, end_date):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid date format or range. Use YYYY-MM-DD format and ensure start_date <= end_date"
+                )
+
+        result = climatology.get_anomalies(city, parameter, start_date, end_date)
+        if not result:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No data found for {city} {parameter} in specified date range"
+            )
+
+        response = {
+            "city": city,
+            "parameter": parameter,
+            "anomalies": result
+        }
+        if start_date and end_date:
+            response.update({
+                "start_date": start_date,
+                "end_date": end_date
+            })
+        return response
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error(f"Database error in get_anomalies: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error in get_anomalies: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 def get_fire_analytics(conn = Depends(get_db)):
     return FireDangerAnalytics(conn)
 
 
-@router.get("/weather/fire-danger/{city}")
+@router.get("/weather/fire-danger/{city}", dependencies=[Depends(city_conditional_get)])
 async def get_fire_danger(
     city: str,
     fire_analytics: FireDangerAnalytics = Depends(get_fire_analytics)
@@ -210,7 +354,7 @@ async def get_fire_danger(
         raise HTTPException(status_code=500, detail=str(e))
     
 
-@router.get("/weather/high-fire-risk/{city}")
+@router.get("/weather/high-fire-risk/{city}", dependencies=[Depends(city_conditional_get)])
 async def get_high_risk_days(
     city: str,
     fire_analytics: FireDangerAnalytics = Depends(get_fire_analytics)
@@ -228,8 +372,115 @@ async def get_high_risk_days(
         raise HTTPException(status_code=500, detail=str(e))  
       
 
+@router.get("/weather/fire-danger-ranking", dependencies=[Depends(cities_conditional_get)])
+async def get_fire_danger_ranking(
+    date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format, defaults to the latest date with data"),
+    limit: int = Query(20, ge=1, le=500, description="Number of top locations to return"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Center latitude for a radius search"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180, description="Center longitude for a radius search"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in km"),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90, description="Bounding box south edge"),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180, description="Bounding box west edge"),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90, description="Bounding box north edge"),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180, description="Bounding box east edge"),
+    fire_analytics: FireDangerAnalytics = Depends(get_fire_analytics)
+) -> Dict:
+    try:
+        radius_params = [latitude, longitude, radius_km]
+        bbox_params = [min_lat, min_lon, max_lat, max_lon]
+        use_radius = any(p is not None for p in radius_params)
+        use_bbox = any(p is not None for p in bbox_params)
+
+        if use_radius and use_bbox:
+            raise HTTPException(
+                status_code=400,
+                detail="Use either latitude/longitude/radius_km or a bounding box, not both"
+            )
+        if use_radius and None in radius_params:
+            raise HTTPException(
+                status_code=400,
+                detail="latitude, longitude and radius_km must be provided together"
+            )
+        if use_bbox and (None in bbox_params or min_lat > max_lat):
+            raise HTTPException(
+                status_code=400,
+                detail="min_lat, min_lon, max_lat and max_lon must be provided together with min_lat <= max_lat"
+            )
+        if date and not WeatherAnalytics.validate_dates(date, date):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid date format. Use YYYY-MM-DD format"
+            )
+
+        location_ids = None
+        distances = {}
+        if use_radius:
+            matches = get_location_index().within_radius(latitude, longitude, radius_km)
+            location_ids = [location.location_id for location, _ in matches]
+            distances = {location.location_id: distance for location, distance in matches}
+        elif use_bbox:
+            matches = get_location_index().within_bbox(min_lat, min_lon, max_lat, max_lon)
+            location_ids = [location.location_id for location in matches]
+
+        result = fire_analytics.rank_locations_by_danger(date, location_ids, limit)
+        if not result['rankings']:
+            raise HTTPException(
+                status_code=404,
+                detail="No fire danger data found for the requested date and region"
+            )
+        if distances:
+            for entry in result['rankings']:
+                entry['distance_km'] = distances[entry['location_id']]
+        return result
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error(f"Database error in get_fire_danger_ranking: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error in get_fire_danger_ranking: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/locations/nearest", dependencies=[Depends(cities_conditional_get)])
+def get_nearest_locations(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100, description="Number of locations to return")
+) -> Dict:
+    try:
+        matches = get_location_index().nearest(latitude, longitude, k)
+        if not matches:
+            raise HTTPException(status_code=404, detail="No locations found in database")
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "locations": [
+                {
+                    "city": location.city_name,
+                    "latitude": location.latitude,
+                    "longitude": location.longitude,
+                    "distance_km": distance
+                }
+                for location, distance in matches
+            ]
+        }
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error(f"Database error in get_nearest_locations: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error in get_nearest_locations: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/init")
-async def startup_event():
+def startup_event():
+    # Imported here so the ingestion stack is only loaded when /init is called
+    from src.database.db_initializer import initialize_database
+
     try:
         initialize_database()
         return {"message": "Database initialization completed successfully"}
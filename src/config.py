@@ -0,0 +1,46 @@
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Settings:
+    db_host: Optional[str]
+    db_port: Optional[str]
+    db_name: Optional[str]
+    db_user: Optional[str]
+    db_password: Optional[str]
+    weather_api_key: Optional[str]
+    log_level: str = "INFO"
+    data_version_ttl_seconds: float = 30.0
+    readiness_ttl_seconds: float = 10.0
+    db_connect_timeout_seconds: int = 5
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Load settings from the environment (and `.env` when present) on first use.
+    Nothing is read at import time so that importing the app stays cheap.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Settings(
+        db_host=os.getenv("HOST"),
+        db_port=os.getenv("PORT"),
+        db_name=os.getenv("DATABASE"),
+        db_user=os.getenv("DB_USER"),
+        db_password=os.getenv("PASSWORD"),
+        weather_api_key=os.getenv("API_KEY_WEATHER"),
+        log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        data_version_ttl_seconds=float(os.getenv("DATA_VERSION_TTL_SECONDS", "30")),
+        readiness_ttl_seconds=float(os.getenv("READINESS_TTL_SECONDS", "10")),
+        db_connect_timeout_seconds=int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5")),
+    )
+
+
+def configure_logging() -> None:
+    logging.basicConfig(level=get_settings().log_level)
@@ -1,31 +1,62 @@
 import logging
-import os
+import threading
+import time
 
-from dotenv import load_dotenv
 import psycopg2
 
+from src.config import get_settings
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-host = os.getenv("HOST")
-port = os.getenv("PORT")
-database = os.getenv("DATABASE")
-user = os.getenv("DB_USER")
-password = os.getenv("PASSWORD")
+_readiness_lock = threading.Lock()
+_readiness = {"checked_at": None, "ready": False}
 
 def get_connection():
+    settings = get_settings()
     try:
         connection = psycopg2.connect(
-            host=host,
-            port=port,
-            database=database,
-            user=user,
-            password=password
+            host=settings.db_host,
+            port=settings.db_port,
+            database=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+            connect_timeout=settings.db_connect_timeout_seconds
         )
         return connection
     except psycopg2.Error as e:
         logger.error(f"Error connecting to the database: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def is_database_ready() -> bool:
+    """
+    Report whether the database accepted a connection recently.
+    The real check runs at most once per readiness TTL, so frequent
+    probes do not open a new connection each time. While a check is
+    running, other probes return the last result instead of waiting.
+    """
+    ttl = get_settings().readiness_ttl_seconds
+    checked_at = _readiness["checked_at"]
+    if checked_at is not None and time.monotonic() - checked_at < ttl:
+        return _readiness["ready"]
+
+    if not _readiness_lock.acquire(blocking=False):
+        return _readiness["ready"]
+    try:
+        ready = False
+        connection = get_connection()
+        if connection is not None:
+            try:
+                with connection.cursor() as cur:
+                    cur.execute("SELECT 1")
+                ready = True
+            except psycopg2.Error as e:
+                logger.error(f"Readiness check failed: {e}")
+            finally:
+                connection.close()
+
+        _readiness["ready"] = ready
+        _readiness["checked_at"] = time.monotonic()
+        return ready
+    finally:
+        _readiness_lock.release()
@@ -3,7 +3,6 @@ import logging
 from .connection import get_connection
 
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def execute_query(query, description):
@@ -1,10 +1,11 @@
 import logging
 
 from .db_executor import execute_query
+from src.services.climatology_service import backfill_baselines
+from src.services.fire_weather_index_service import backfill_fire_weather_indices
 from src.services.weather_data_service import get_weather_data
 
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 create_location_query = """
@@ -57,23 +58,80 @@ create_hourly_query = """
     );
     """
 
-def create_table(query):
-    return execute_query(query, "created locations table")
+alter_location_version_query = """
+    ALTER TABLE locations
+        ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS data_updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP;
+    """
+
+create_climatology_query = """
+    CREATE TABLE IF NOT EXISTS climatology_baselines (
+        location_id INTEGER REFERENCES locations(location_id),
+        parameter VARCHAR(50) NOT NULL,
+        day_of_year SMALLINT NOT NULL,
+        sample_count INTEGER NOT NULL,
+        mean DECIMAL(8,3),
+        stddev DECIMAL(8,3),
+        min_value DECIMAL(8,3),
+        p10 DECIMAL(8,3),
+        p25 DECIMAL(8,3),
+        p50 DECIMAL(8,3),
+        p75 DECIMAL(8,3),
+        p90 DECIMAL(8,3),
+        max_value DECIMAL(8,3),
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(location_id, parameter, day_of_year)
+    );
+    CREATE INDEX IF NOT EXISTS idx_daily_weather_location_doy
+        ON daily_weather (location_id, (EXTRACT(DOY FROM date)));
+    """
+
+create_daily_date_index_query = """
+    CREATE INDEX IF NOT EXISTS idx_daily_weather_date ON daily_weather (date);
+    """
+
+create_fire_weather_indices_query = """
+    CREATE TABLE IF NOT EXISTS fire_weather_indices (
+        location_id INTEGER REFERENCES locations(location_id),
+        date DATE NOT NULL,
+        consecutive_dry_days INTEGER NOT NULL,
+        precipitation_7d DECIMAL(7,2) NOT NULL,
+        precipitation_30d DECIMAL(7,2) NOT NULL,
+        temp_max_7d DECIMAL(5,2) NOT NULL,
+        humidity_min_7d DECIMAL(5,2) NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(location_id, date)
+    );
+    """
+
+create_table_steps = [
+    (create_location_query, "created locations table"),
+    (create_daily_query, "created daily weather table"),
+    (create_hourly_query, "created hourly weather table"),
+    (alter_location_version_query, "added locations data version columns"),
+    (create_climatology_query, "created climatology baselines table"),
+    (create_fire_weather_indices_query, "created fire weather indices table"),
+    (create_daily_date_index_query, "created daily weather date index"),
+]
 
 def create_tables():
     logger.info("Starting database create tables initialization...")
-    if create_table(create_location_query):
-        if create_table(create_daily_query):
-            if create_table(create_hourly_query):
-                logger.info("Database create tables completed successfully!")
-                return True
-    
-    logger.error("Database initialization failed!")
-    return False
+    for query, description in create_table_steps:
+        if not execute_query(query, description):
+            logger.error("Database initialization failed!")
+            return False
+
+    logger.info("Database create tables completed successfully!")
+    return True
 
 def initialize_database():
     if create_tables():
         get_weather_data()
+        # Ingestion only derives data for new days, so fill in anything missing
+        if not backfill_baselines():
+            logger.error("Failed to backfill climatology baselines")
+        if not backfill_fire_weather_indices():
+            logger.error("Failed to backfill fire weather indices")
         logger.info("successfully finish data base initialization...")
 
         
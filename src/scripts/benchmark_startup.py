@@ -0,0 +1,68 @@
+"""
+Measure how long it takes to import the API app in a fresh interpreter.
+
+Usage:
+    python -m src.scripts.benchmark_startup [--runs 10] [--budget-ms 1500]
+
+Exits non-zero when the median import time exceeds the budget, or when
+importing `src.main` pulls in modules that should only load on demand
+(the ingestion stack) or performs startup side effects (reading `.env`).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+DEFERRED_MODULES = [
+    "src.database.db_initializer",
+    "src.services.weather_data_service",
+    "dotenv",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.main
+elapsed_ms = (time.perf_counter() - start) * 1000
+loaded = [name for name in {deferred!r} if name in sys.modules]
+print(json.dumps({{"elapsed_ms": elapsed_ms, "loaded": loaded}}))
+"""
+
+
+def measure_once() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(deferred=DEFERRED_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API import time")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    timings = sorted(sample["elapsed_ms"] for sample in samples)
+    median = statistics.median(timings)
+    print(f"runs={args.runs} min={timings[0]:.1f}ms median={median:.1f}ms max={timings[-1]:.1f}ms")
+
+    failed = False
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+    if loaded:
+        print(f"FAIL: importing src.main loaded deferred modules: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median import time {median:.1f}ms exceeds budget {args.budget_ms:.1f}ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""
+Replay a configurable mix of API calls and report throughput, latency
+percentiles and error rates per route.
+
+Usage:
+    # Against a running server (e.g. one weather-app replica port-forwarded to localhost)
+    python -m src.scripts.load_test --base-url http://localhost:8000 --concurrency 20 --duration 60
+
+    # In-process, driving the ASGI app directly (no server, database still required)
+    python -m src.scripts.load_test --in-process --rate 50 --duration 30
+
+    # Custom mix and polling clients that revalidate with ETags
+    python -m src.scripts.load_test --mix cities=1,extremes=2,fire-danger=5 --revalidate
+
+Closed-loop mode (--concurrency) runs a fixed number of clients back to back.
+Open-loop mode (--rate) starts requests at a fixed arrival rate; latency is
+measured from the scheduled start, so queueing delay is included.
+
+Any response other than 2xx or 304, and any request that raised, counts as
+an error. 4xx responses are also reported on their own, since they usually
+point at the request mix (unknown city, bad dates) rather than the server.
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlencode, urlsplit
+
+
+ROUTES = ("cities", "extremes", "average", "fire-danger", "high-fire-risk")
+DEFAULT_MIX = "cities=1,extremes=2,average=2,fire-danger=3,high-fire-risk=2"
+DEFAULT_PARAMETERS = "temp_max,temp_min,humidity,wind_speed,precipitation"
+
+Response = Tuple[int, Dict[str, str]]
+
+
+class RequestFactory:
+    """Builds request paths for each route name"""
+
+    def __init__(self, cities: List[str], parameters: List[str],
+                 start_date: Optional[str], end_date: Optional[str], seed: Optional[int]):
+        self.cities = cities
+        self.parameters = parameters
+        self.start_date = start_date
+        self.end_date = end_date
+        self.random = random.Random(seed)
+
+    def _date_query(self) -> str:
+        if self.start_date and self.end_date and self.random.random() < 0.5:
+            return "?" + urlencode({"start_date": self.start_date, "end_date": self.end_date})
+        return ""
+
+    def build(self, route: str) -> str:
+        city = quote(self.random.choice(self.cities), safe="")
+        parameter = self.random.choice(self.parameters)
+        if route == "cities":
+            return "/cities"
+        if route == "extremes":
+            return f"/weather/extremes/{city}/{parameter}{self._date_query()}"
+        if route == "average":
+            return f"/weather/average/{city}/{parameter}{self._date_query()}"
+        if route == "fire-danger":
+            return f"/weather/fire-danger/{city}"
+        if route == "high-fire-risk":
+            return f"/weather/high-fire-risk/{city}"
+        raise ValueError(f"Unknown route: {route}")
+
+
+class InProcessClient:
+    """Sends GET requests straight into the ASGI app, without a server"""
+
+    def __init__(self):
+        from src.main import app
+
+        self.app = app
+
+    async def get(self, path: str, headers: Dict[str, str]) -> Response:
+        raw_path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": unquote(raw_path),
+            "raw_path": raw_path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"loadtest")] + [
+                (name.lower().encode(), value.encode()) for name, value in headers.items()
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        response: Dict = {"status": None, "headers": {}}
+        request_sent = False
+        done = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {
+                    name.decode().lower(): value.decode() for name, value in message["headers"]
+                }
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            done.set()
+        return response["status"], response["headers"]
+
+    def close(self):
+        pass
+
+
+class HttpClient:
+    """Blocking keep-alive HTTP connections, one per worker thread"""
+
+    def __init__(self, base_url: str, workers: int, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.https = parts.scheme == "https"
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.local = threading.local()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            factory = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = factory(self.host, self.port, timeout=self.timeout)
+            self.local.conn = conn
+        return conn
+
+    def _get(self, path: str, headers: Dict[str, str]) -> Response:
+        conn = self._connection()
+        try:
+            conn.request("GET", self.prefix + path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            return resp.status, {name.lower(): value for name, value in resp.getheaders()}
+        except Exception:
+            conn.close()
+            self.local.conn = None
+            raise
+
+    async def get(self, path: str, headers: Dict[str, str]) -> Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._get, path, headers)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.client_errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, latency: float, status: Optional[int]) -> None:
+        self.latencies[route].append(latency)
+        self.statuses[route][str(status) if status is not None else "exception"] += 1
+        if status is None or not (200 <= status < 300 or status == 304):
+            self.errors[route] += 1
+        if status is not None and 400 <= status < 500:
+            self.client_errors[route] += 1
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        route, _, weight = item.partition("=")
+        route = route.strip()
+        if route not in ROUTES:
+            raise ValueError(f"Unknown route in mix: {route}. Use: {', '.join(ROUTES)}")
+        weights[route] = float(weight or 1)
+    if not any(weights.values()):
+        raise ValueError("Route mix must have at least one positive weight")
+    return weights
+
+
+class LoadTest:
+    def __init__(self, client, factory: RequestFactory, mix: Dict[str, float], revalidate: bool):
+        self.client = client
+        self.factory = factory
+        self.routes = list(mix)
+        self.weights = [mix[route] for route in self.routes]
+        self.revalidate = revalidate
+        self.etags: Dict[str, str] = {}
+        self.stats = Stats()
+        self.recording = False
+
+    async def one_request(self, scheduled: Optional[float] = None) -> None:
+        route = self.factory.random.choices(self.routes, self.weights)[0]
+        path = self.factory.build(route)
+        headers = {"Accept-Encoding": "gzip"}
+        if self.revalidate and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+
+        start = scheduled if scheduled is not None else time.perf_counter()
+        status = None
+        try:
+            status, response_headers = await self.client.get(path, headers)
+            if self.revalidate and "etag" in response_headers:
+                self.etags[path] = response_headers["etag"]
+        except Exception:
+            status = None
+        if self.recording:
+            self.stats.record(route, time.perf_counter() - start, status)
+
+    async def closed_loop(self, concurrency: int, deadline: float) -> None:
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.one_request()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, rate: float, deadline: float, max_inflight: int) -> int:
+        """Start requests at a fixed rate; returns how many were dropped at max_inflight"""
+        interval = 1.0 / rate
+        inflight = set()
+        dropped = 0
+        next_start = time.perf_counter()
+        while next_start < deadline:
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(inflight) >= max_inflight:
+                dropped += 1
+            else:
+                task = asyncio.ensure_future(self.one_request(scheduled=next_start))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+            next_start += interval
+        if inflight:
+            await asyncio.gather(*inflight)
+        return dropped
+
+
+def report(stats: Stats, elapsed: float, dropped: int) -> Dict:
+    summary = {"elapsed_seconds": round(elapsed, 3), "dropped": dropped, "routes": {}}
+    total_requests = total_errors = total_client_errors = 0
+    all_latencies: List[float] = []
+    for route in sorted(stats.latencies):
+        latencies = sorted(stats.latencies[route])
+        all_latencies.extend(latencies)
+        count = len(latencies)
+        errors = stats.errors[route]
+        client_errors = stats.client_errors[route]
+        total_requests += count
+        total_errors += errors
+        total_client_errors += client_errors
+        summary["routes"][route] = {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2),
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "client_error_rate": round(client_errors / count, 4) if count else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "statuses": dict(stats.statuses[route]),
+        }
+    all_latencies.sort()
+    summary["total"] = {
+        "requests": total_requests,
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+        "client_error_rate": round(total_client_errors / total_requests, 4) if total_requests else 0.0,
+        "p50_ms": round(percentile(all_latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(all_latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(all_latencies, 99) * 1000, 2),
+    }
+    return summary
+
+
+def print_report(summary: Dict) -> None:
+    header = f"{'route':<16}{'requests':>10}{'rps':>10}{'errors':>9}{'4xx':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["routes"].items()) + [("TOTAL", summary["total"])]
+    for route, data in rows:
+        statuses = ", ".join(f"{k}:{v}" for k, v in sorted(data.get("statuses", {}).items()))
+        print(
+            f"{route:<16}{data['requests']:>10}{data['throughput_rps']:>10.1f}"
+            f"{data['error_rate'] * 100:>8.2f}%{data['client_error_rate'] * 100:>8.2f}%"
+            f"{data['p50_ms']:>10.1f}{data['p95_ms']:>10.1f}"
+            f"{data['p99_ms']:>10.1f}  {statuses}"
+        )
+    print(f"elapsed {summary['elapsed_seconds']}s, dropped {summary['dropped']}")
+
+
+async def run(args) -> Dict:
+    factory = RequestFactory(
+        [city.strip() for city in args.cities.split(";")],
+        [p.strip() for p in args.parameters.split(",")],
+        args.start_date,
+        args.end_date,
+        args.seed,
+    )
+    open_loop = args.rate is not None
+    workers = args.max_inflight if open_loop else args.concurrency
+    client = InProcessClient() if args.in_process else HttpClient(args.base_url, workers, args.timeout)
+    test = LoadTest(client, factory, parse_mix(args.mix), args.revalidate)
+    try:
+        if args.warmup > 0:
+            await test.closed_loop(min(workers, 4), time.perf_counter() + args.warmup)
+
+        test.recording = True
+        start = time.perf_counter()
+        deadline = start + args.duration
+        dropped = 0
+        if open_loop:
+            dropped = await test.open_loop(args.rate, deadline, args.max_inflight)
+        else:
+            await test.closed_loop(args.concurrency, deadline)
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+    return report(test.stats, elapsed, dropped)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the weather API")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default="http://localhost:8000", help="Server to test")
+    target.add_argument("--in-process", action="store_true", help="Drive the ASGI app directly")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=10, help="Closed loop: number of concurrent clients")
+    load.add_argument("--rate", type=float, help="Open loop: requests started per second")
+    parser.add_argument("--max-inflight", type=int, default=200, help="Open loop: cap on outstanding requests")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured warmup seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Route weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--cities", default="Los Angeles, CA, United States", help="Cities separated by ';'")
+    parser.add_argument("--parameters", default=DEFAULT_PARAMETERS, help="Parameters for extremes/average")
+    parser.add_argument("--start-date", help="Date range used for half of extremes/average calls")
+    parser.add_argument("--end-date", help="Date range used for half of extremes/average calls")
+    parser.add_argument("--revalidate", action="store_true", help="Resend ETags as If-None-Match")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--seed", type=int, help="Random seed for a reproducible request sequence")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.max_inflight < 1:
+        parser.error("--max-inflight must be at least 1")
+    if args.duration <= 0:
+        parser.error("--duration must be greater than 0")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    if args.timeout <= 0:
+        parser.error("--timeout must be greater than 0")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    summary = asyncio.run(run(args))
+    print_report(summary)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
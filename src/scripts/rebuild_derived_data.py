@@ -0,0 +1,37 @@
+"""
+Recompute derived tables from the full daily_weather history.
+
+PUT /init only fills in locations that have no derived rows yet. Use this
+after an incremental refresh failed during ingestion (the failure is only
+logged) or after changing how the derived data is computed.
+
+Usage:
+    python -m src.scripts.rebuild_derived_data
+"""
+import logging
+import sys
+
+from src.config import configure_logging
+from src.services.climatology_service import rebuild_baselines
+from src.services.fire_weather_index_service import rebuild_fire_weather_indices
+
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    configure_logging()
+    ok = True
+    if rebuild_baselines():
+        logger.info("Rebuilt climatology baselines")
+    else:
+        ok = False
+    if rebuild_fire_weather_indices():
+        logger.info("Rebuilt fire weather indices")
+    else:
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
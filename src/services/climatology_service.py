@@ -0,0 +1,298 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from src.database.connection import get_connection
+
+
+logger = logging.getLogger(__name__)
+
+CLIMATOLOGY_PARAMETERS = ("temp_max", "temp_min", "humidity", "wind_speed", "precipitation")
+
+# Each baseline day pools observations within +/- this many calendar days.
+# Windows follow the real calendar of each observation's year, so they wrap
+# correctly across Dec 31 in both leap and non-leap years. Day of year 366
+# only exists in leap years and so has fewer samples.
+CLIMATOLOGY_WINDOW_DAYS = 7
+
+DAYS_IN_YEAR = 366
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+_parameter_values = ", ".join(f"('{p}', dw.{p})" for p in CLIMATOLOGY_PARAMETERS)
+
+# One pass over daily_weather: every observation is fanned out to the baseline
+# days whose smoothing window contains it (the day of year of date +/- shift),
+# then grouped per (location, parameter, day)
+upsert_baselines_query = f"""
+    INSERT INTO climatology_baselines (
+        location_id, parameter, day_of_year, sample_count,
+        mean, stddev, min_value, p10, p25, p50, p75, p90, max_value, updated_at
+    )
+    SELECT
+        dw.location_id,
+        p.parameter,
+        EXTRACT(DOY FROM dw.date + o.shift)::smallint AS day_of_year,
+        COUNT(p.value),
+        AVG(p.value),
+        STDDEV_SAMP(p.value),
+        MIN(p.value),
+        percentile_cont(0.10) WITHIN GROUP (ORDER BY p.value),
+        percentile_cont(0.25) WITHIN GROUP (ORDER BY p.value),
+        percentile_cont(0.50) WITHIN GROUP (ORDER BY p.value),
+        percentile_cont(0.75) WITHIN GROUP (ORDER BY p.value),
+        percentile_cont(0.90) WITHIN GROUP (ORDER BY p.value),
+        MAX(p.value),
+        CURRENT_TIMESTAMP
+    FROM daily_weather dw
+    CROSS JOIN LATERAL (VALUES {_parameter_values}) AS p(parameter, value)
+    CROSS JOIN generate_series(-{CLIMATOLOGY_WINDOW_DAYS}, {CLIMATOLOGY_WINDOW_DAYS}) AS o(shift)
+    WHERE p.value IS NOT NULL
+    {{filters}}
+    GROUP BY dw.location_id, p.parameter, 3
+    ON CONFLICT (location_id, parameter, day_of_year) DO UPDATE SET
+        sample_count = EXCLUDED.sample_count,
+        mean = EXCLUDED.mean,
+        stddev = EXCLUDED.stddev,
+        min_value = EXCLUDED.min_value,
+        p10 = EXCLUDED.p10,
+        p25 = EXCLUDED.p25,
+        p50 = EXCLUDED.p50,
+        p75 = EXCLUDED.p75,
+        p90 = EXCLUDED.p90,
+        max_value = EXCLUDED.max_value,
+        updated_at = EXCLUDED.updated_at;
+"""
+
+
+def _affected_days(new_dates: Iterable[str]) -> List[int]:
+    """Days of year whose baseline window contains any of the given dates"""
+    result = set()
+    for value in new_dates:
+        day = datetime.strptime(value, '%Y-%m-%d').date()
+        for shift in range(-CLIMATOLOGY_WINDOW_DAYS, CLIMATOLOGY_WINDOW_DAYS + 1):
+            result.add((day + timedelta(days=shift)).timetuple().tm_yday)
+    return sorted(result)
+
+
+def _days_within(days: Iterable[int], window: int) -> List[int]:
+    """
+    All days of year within `window` days of any of `days`, wrapping modulo 366.
+    Only used as an index pre-filter; across the end of a non-leap year the
+    modulo-366 distance is one more than the real one, so callers add a day.
+    """
+    result = set()
+    for day in days:
+        for shift in range(-window, window + 1):
+            result.add(((day - 1 + shift) % DAYS_IN_YEAR) + 1)
+    return sorted(result)
+
+
+def _has_baselines(location_id: int) -> bool:
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM climatology_baselines WHERE location_id = %s)",
+            (location_id,)
+        )
+        return cursor.fetchone()[0]
+    finally:
+        connection.close()
+
+
+def rebuild_baselines(location_id: Optional[int] = None) -> bool:
+    """Recompute baselines from the full history of one location, or of all locations"""
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        if location_id is None:
+            cursor.execute(upsert_baselines_query.format(filters=""))
+        else:
+            cursor.execute(
+                upsert_baselines_query.format(filters="AND dw.location_id = %(location_id)s"),
+                {"location_id": location_id}
+            )
+        connection.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Error rebuilding climatology baselines: {e}")
+        connection.rollback()
+        return False
+    finally:
+        connection.close()
+
+
+def backfill_baselines() -> bool:
+    """
+    Build baselines for every location that has daily data but none yet,
+    e.g. a database populated before baselines existed or a location whose
+    first build failed.
+    """
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(upsert_baselines_query.format(filters="""
+            AND NOT EXISTS (
+                SELECT 1 FROM climatology_baselines b WHERE b.location_id = dw.location_id
+            )
+        """))
+        connection.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Error backfilling climatology baselines: {e}")
+        connection.rollback()
+        return False
+    finally:
+        connection.close()
+
+
+def update_baselines(location_id: int, new_dates: List[str]) -> bool:
+    """
+    Refresh the baselines affected by newly ingested days of one location.
+    Only observations whose day of year can fall into an affected smoothing
+    window are read, using the (location_id, day of year) index.
+    """
+    if not new_dates:
+        return True
+
+    if not _has_baselines(location_id):
+        return rebuild_baselines(location_id)
+
+    affected_days = _affected_days(new_dates)
+    source_days = _days_within(affected_days, CLIMATOLOGY_WINDOW_DAYS + 1)
+    filters = """
+        AND dw.location_id = %(location_id)s
+        AND EXTRACT(DOY FROM dw.date) = ANY(%(source_days)s)
+        AND EXTRACT(DOY FROM dw.date + o.shift)::smallint = ANY(%(affected_days)s)
+    """
+
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            upsert_baselines_query.format(filters=filters),
+            {
+                "location_id": location_id,
+                "source_days": source_days,
+                "affected_days": affected_days,
+            }
+        )
+        connection.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Error updating climatology baselines: {e}")
+        connection.rollback()
+        return False
+    finally:
+        connection.close()
+
+
+class ClimatologyAnalytics:
+    def __init__(self, db_connection):
+        self.conn = db_connection
+
+    def _percentile_rank(self, value: float, row: Dict) -> Optional[float]:
+        """
+        Approximate percentile rank of a value by linear interpolation
+        between the stored baseline min, percentiles and max
+        """
+        knots = [(row['min_value'], 0.0)]
+        knots += [(row[f'p{p}'], float(p)) for p in PERCENTILES]
+        knots.append((row['max_value'], 100.0))
+        knots = [(float(v), rank) for v, rank in knots if v is not None]
+        if not knots:
+            return None
+
+        if value <= knots[0][0]:
+            return knots[0][1]
+        for (low_value, low_rank), (high_value, high_rank) in zip(knots, knots[1:]):
+            if value <= high_value:
+                if high_value == low_value:
+                    return high_rank
+                fraction = (value - low_value) / (high_value - low_value)
+                return round(low_rank + fraction * (high_rank - low_rank), 1)
+        return knots[-1][1]
+
+    def get_anomalies(self, city_name: str, parameter: str,
+                      start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
+        """
+        Compare each day's value with its day-of-year baseline.
+        Returns z-scores and percentile ranks; baselines are read by primary key.
+
+        Raises:
+            ValueError: If the parameter has no baseline
+            psycopg2.Error: If there's a database-related error
+        """
+        if parameter not in CLIMATOLOGY_PARAMETERS:
+            raise ValueError(f"No climatology baseline for parameter: {parameter}")
+
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                query = """
+                    SELECT
+                        dw.date,
+                        dw.{param} AS value,
+                        b.sample_count,
+                        b.mean,
+                        b.stddev,
+                        b.min_value,
+                        b.p10, b.p25, b.p50, b.p75, b.p90,
+                        b.max_value
+                    FROM daily_weather dw
+                    JOIN locations l ON dw.location_id = l.location_id
+                    LEFT JOIN climatology_baselines b
+                        ON b.location_id = dw.location_id
+                        AND b.parameter = %s
+                        AND b.day_of_year = EXTRACT(DOY FROM dw.date)::smallint
+                    WHERE l.city_name = %s
+                """.format(param=parameter)
+
+                params = [parameter, city_name]
+
+                if start_date and end_date:
+                    query += " AND dw.date BETWEEN %s AND %s"
+                    params.extend([start_date, end_date])
+
+                query += " ORDER BY dw.date"
+
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+            anomalies = []
+            for row in rows:
+                value = float(row['value']) if row['value'] is not None else None
+                entry = {
+                    'date': row['date'].strftime('%Y-%m-%d'),
+                    'value': value,
+                    'baseline_mean': None,
+                    'baseline_stddev': None,
+                    'sample_count': row['sample_count'] or 0,
+                    'z_score': None,
+                    'percentile_rank': None,
+                }
+                if value is not None and row['mean'] is not None:
+                    mean = float(row['mean'])
+                    entry['baseline_mean'] = round(mean, 3)
+                    if row['stddev'] is not None:
+                        stddev = float(row['stddev'])
+                        entry['baseline_stddev'] = round(stddev, 3)
+                        if stddev > 0:
+                            entry['z_score'] = round((value - mean) / stddev, 2)
+                    entry['percentile_rank'] = self._percentile_rank(value, row)
+                anomalies.append(entry)
+
+            return anomalies
+
+        except psycopg2.Error as e:
+            logging.error(f"Database error in get_anomalies: {e}")
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error in get_anomalies: {e}")
+            raise
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import psycopg2
+
+from src.config import get_settings
+from src.database.connection import get_connection
+
+
+logger = logging.getLogger(__name__)
+
+ALL_LOCATIONS = "*"
+
+DataVersion = Tuple[str, Optional[datetime]]
+
+# Versions of every location, loaded together and refreshed once per TTL.
+# Bounded by the number of locations; unknown city names never reach the DB.
+_snapshot: Optional[Dict[str, Optional[DataVersion]]] = None
+_location_set_version: Optional[str] = None
+_snapshot_expires_at = 0.0
+_refresh_lock = threading.Lock()
+
+
+def _load_snapshot() -> Optional[Tuple[Dict[str, Optional[DataVersion]], str]]:
+    connection = get_connection()
+    if connection is None:
+        return None
+    try:
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT city_name, location_id, data_version, data_updated_at FROM locations"
+            )
+            rows = cur.fetchall()
+    except psycopg2.Error as e:
+        logger.error(f"Error reading data versions: {e}")
+        return None
+    finally:
+        connection.close()
+
+    snapshot: Dict[str, Optional[DataVersion]] = {
+        city_name: (f"{location_id}-{data_version}", data_updated_at)
+        for city_name, location_id, data_version, data_updated_at in rows
+    }
+    timestamps = [row[3] for row in rows if row[3] is not None]
+    snapshot[ALL_LOCATIONS] = (
+        f"all-{len(rows)}-{sum(row[2] for row in rows)}",
+        max(timestamps) if timestamps else None
+    )
+    # Locations are never updated after insert, so count and highest id
+    # identify the set regardless of how often their data changes
+    location_set_version = f"{len(rows)}-{max((row[1] for row in rows), default=0)}"
+    return snapshot, location_set_version
+
+
+def _get_snapshot() -> Optional[Dict[str, Optional[DataVersion]]]:
+    global _snapshot, _location_set_version, _snapshot_expires_at
+
+    if _snapshot is not None and time.monotonic() < _snapshot_expires_at:
+        return _snapshot
+
+    # Only one thread refreshes; others keep serving the stale snapshot meanwhile
+    if not _refresh_lock.acquire(blocking=_snapshot is None):
+        return _snapshot
+    try:
+        if _snapshot is not None and time.monotonic() < _snapshot_expires_at:
+            return _snapshot
+        loaded = _load_snapshot()
+        if loaded is None:
+            return None
+        _snapshot, _location_set_version = loaded
+        _snapshot_expires_at = time.monotonic() + get_settings().data_version_ttl_seconds
+        return _snapshot
+    finally:
+        _refresh_lock.release()
+
+
+def get_data_version(city_name: str = ALL_LOCATIONS) -> Optional[DataVersion]:
+    """
+    Return (version token, last modified) for a city, or for the whole
+    locations table when city_name is ALL_LOCATIONS.
+
+    Versions of all locations are cached in-process for the configured data
+    version TTL so that conditional requests can be answered without touching
+    the database. Returns None when the city is unknown or the versions
+    cannot be read.
+    """
+    snapshot = _get_snapshot()
+    if snapshot is None:
+        return None
+    return snapshot.get(city_name)
+
+
+def get_location_set_version() -> Optional[str]:
+    """
+    Token that changes when locations are added or removed, but not when
+    their weather data changes. Read from the same cached snapshot as
+    get_data_version; None when the versions cannot be read.
+    """
+    if _get_snapshot() is None:
+        return None
+    return _location_set_version
+
+
+def bump_data_version(cursor, location_id: int) -> None:
+    """Mark a location's data as changed; caller commits the transaction"""
+    cursor.execute(
+        """
+        UPDATE locations
+        SET data_version = data_version + 1,
+            data_updated_at = CURRENT_TIMESTAMP
+        WHERE location_id = %s
+        """,
+        (location_id,)
+    )
+
+
+def invalidate_data_versions() -> None:
+    """
+    Drop this process's cached versions. Other workers and replicas keep
+    theirs until the TTL expires, so their validators can lag by that much.
+    """
+    global _snapshot_expires_at
+    _snapshot_expires_at = 0.0
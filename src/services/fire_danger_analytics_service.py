@@ -1,6 +1,6 @@
 import logging
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
@@ -9,11 +9,12 @@ class FireDangerAnalytics:
     def __init__(self, db_connection):
         self.conn = db_connection
 
-    def _calculate_danger_rating(self, temp_max: float, wind_speed: float, 
-                               humidity: float, precipitation: float) -> str:
+    def _calculate_danger_score(self, temp_max: float, wind_speed: float,
+                                humidity: float, precipitation: float,
+                                consecutive_dry_days: int = 0) -> int:
         """
-        Calculate fire danger rating based on weather parameters
-        Returns a string rating: 'Low', 'Moderate', 'High', or 'Extreme'
+        Calculate a numeric fire danger score based on weather parameters
+        and the length of the current dry spell
         """
         danger_score = 0
         
@@ -45,6 +46,14 @@ class FireDangerAnalytics:
         elif precipitation > 0:
             danger_score -= 1
 
+        if consecutive_dry_days >= 14:
+            danger_score += 2
+        elif consecutive_dry_days >= 7:
+            danger_score += 1
+
+        return danger_score
+
+    def _rating_from_score(self, danger_score: int) -> str:
         if danger_score >= 7:  
             return "Extreme"
         elif danger_score >= 5:
@@ -54,6 +63,18 @@ class FireDangerAnalytics:
         else:
             return "Low"
 
+    def _calculate_danger_rating(self, temp_max: float, wind_speed: float, 
+                               humidity: float, precipitation: float,
+                               consecutive_dry_days: int = 0) -> str:
+        """
+        Calculate fire danger rating based on weather parameters
+        and the length of the current dry spell
+        Returns a string rating: 'Low', 'Moderate', 'High', or 'Extreme'
+        """
+        return self._rating_from_score(self._calculate_danger_score(
+            temp_max, wind_speed, humidity, precipitation, consecutive_dry_days
+        ))
+
     def get_fire_danger_by_date(self, city_name: str) -> List[Dict]:
         """
         Analyze fire danger for each day in the database for a specific city
@@ -72,9 +93,16 @@ class FireDangerAnalytics:
                         dw.temp_max,
                         dw.wind_speed,
                         dw.humidity,
-                        dw.precipitation
+                        dw.precipitation,
+                        fwi.consecutive_dry_days,
+                        fwi.precipitation_7d,
+                        fwi.precipitation_30d,
+                        fwi.temp_max_7d,
+                        fwi.humidity_min_7d
                     FROM daily_weather dw
                     JOIN locations l ON dw.location_id = l.location_id
+                    LEFT JOIN fire_weather_indices fwi
+                        ON fwi.location_id = dw.location_id AND fwi.date = dw.date
                     WHERE l.city_name = %s
                     ORDER BY dw.date DESC;
                 """
@@ -89,11 +117,13 @@ class FireDangerAnalytics:
                 fire_danger_ratings = []
                 for row in results:
                     try:
+                        dry_days = row['consecutive_dry_days'] or 0
                         rating = self._calculate_danger_rating(
                             row['temp_max'],
                             row['wind_speed'],
                             row['humidity'],
-                            row['precipitation']
+                            row['precipitation'],
+                            dry_days
                         )
                         
                         fire_danger_ratings.append({
@@ -108,8 +138,10 @@ class FireDangerAnalytics:
                                     float(row['temp_max']),
                                     float(row['wind_speed']),
                                     float(row['humidity']),
-                                    float(row['precipitation'])
-                                )
+                                    float(row['precipitation']),
+                                    dry_days
+                                ),
+                                'rolling_indices': self._format_rolling_indices(row)
                             }
                         })
                     except (ValueError, TypeError) as e:
@@ -125,7 +157,20 @@ class FireDangerAnalytics:
             logging.error(f"Unexpected error in get_fire_danger_by_date: {e}")
             raise
 
-    def _get_risk_factors(self, temp: float, wind: float, humidity: float, precip: float) -> List[str]:
+    def _format_rolling_indices(self, row: Dict) -> Optional[Dict]:
+        """Rolling multi-day indices for a row, or None if not yet computed"""
+        if row['consecutive_dry_days'] is None:
+            return None
+        return {
+            'consecutive_dry_days': row['consecutive_dry_days'],
+            'precipitation_7d': float(row['precipitation_7d']),
+            'precipitation_30d': float(row['precipitation_30d']),
+            'temp_max_7d': float(row['temp_max_7d']),
+            'humidity_min_7d': float(row['humidity_min_7d'])
+        }
+
+    def _get_risk_factors(self, temp: float, wind: float, humidity: float, precip: float,
+                          consecutive_dry_days: int = 0) -> List[str]:
         """
         Identify specific risk factors contributing to fire danger
         """
@@ -147,6 +192,11 @@ class FireDangerAnalytics:
             
         if precip <= 0:
             factors.append("No precipitation")
+
+        if consecutive_dry_days >= 14:
+            factors.append("Prolonged dry spell")
+        elif consecutive_dry_days >= 7:
+            factors.append("Dry spell")
         
         return factors
 
@@ -156,4 +206,99 @@ class FireDangerAnalytics:
         """
         all_ratings = self.get_fire_danger_by_date(city_name)
         return [day for day in all_ratings 
-                if day['rating'] in ['High', 'Extreme']]
\ No newline at end of file
+                if day['rating'] in ['High', 'Extreme']]
+
+    def rank_locations_by_danger(self, date: Optional[str] = None, location_ids: Optional[List[int]] = None,
+                                 limit: int = 20) -> Dict:
+        """
+        Rate every location (or the given location_ids) using a single query,
+        and return the top `limit` by danger score.
+        Without a date each location is rated on its own latest day with data,
+        so locations whose ingestion lags behind are not dropped.
+        The query returns one row per location; scoring and the top-N cut
+        happen in Python so the thresholds stay in _calculate_danger_score.
+
+        Raises:
+            psycopg2.Error: If there's a database-related error
+        """
+        if location_ids is not None and not location_ids:
+            return {'date': date, 'rankings': []}
+
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                # One index probe per location on UNIQUE(location_id, date)
+                # instead of scanning daily_weather for each location's latest row
+                date_filter = "AND date = %s" if date is not None else ""
+                where = "WHERE l.location_id = ANY(%s)" if location_ids is not None else ""
+                params = [p for p in (date, location_ids) if p is not None]
+
+                query = f"""
+                    SELECT
+                        dw.date,
+                        l.location_id,
+                        l.city_name,
+                        l.latitude,
+                        l.longitude,
+                        dw.temp_max,
+                        dw.wind_speed,
+                        dw.humidity,
+                        dw.precipitation,
+                        fwi.consecutive_dry_days
+                    FROM locations l
+                    CROSS JOIN LATERAL (
+                        SELECT date, temp_max, wind_speed, humidity, precipitation
+                        FROM daily_weather
+                        WHERE location_id = l.location_id {date_filter}
+                        ORDER BY date DESC
+                        LIMIT 1
+                    ) dw
+                    LEFT JOIN fire_weather_indices fwi
+                        ON fwi.location_id = l.location_id AND fwi.date = dw.date
+                    {where}
+                """
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+            ranked = []
+            for row in rows:
+                try:
+                    dry_days = row['consecutive_dry_days'] or 0
+                    score = self._calculate_danger_score(
+                        float(row['temp_max']),
+                        float(row['wind_speed']),
+                        float(row['humidity']),
+                        float(row['precipitation']),
+                        dry_days
+                    )
+                    ranked.append({
+                        'date': row['date'].strftime('%Y-%m-%d'),
+                        'location_id': row['location_id'],
+                        'city': row['city_name'],
+                        'latitude': float(row['latitude']),
+                        'longitude': float(row['longitude']),
+                        'score': score,
+                        'rating': self._rating_from_score(score),
+                        'risk_factors': self._get_risk_factors(
+                            float(row['temp_max']),
+                            float(row['wind_speed']),
+                            float(row['humidity']),
+                            float(row['precipitation']),
+                            dry_days
+                        )
+                    })
+                except (ValueError, TypeError) as e:
+                    logging.error(f"Error processing row data: {e}")
+                    continue
+
+            ranked.sort(key=lambda entry: (-entry['score'], entry['city']))
+            return {
+                'date': max(row['date'] for row in rows).strftime('%Y-%m-%d') if rows else date,
+                'rankings': ranked[:limit]
+            }
+
+        except psycopg2.Error as e:
+            logging.error(f"Database error in rank_locations_by_danger: {e}")
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error in rank_locations_by_danger: {e}")
+            raise
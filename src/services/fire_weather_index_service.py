@@ -0,0 +1,252 @@
+import logging
+from collections import deque
+from datetime import date, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+from src.database.connection import get_connection
+
+
+logger = logging.getLogger(__name__)
+
+# A day with less than this much precipitation (mm) counts as dry
+DRY_DAY_MAX_PRECIPITATION = 1.0
+
+SHORT_WINDOW_DAYS = 7
+LONG_WINDOW_DAYS = 30
+
+upsert_indices_query = """
+    INSERT INTO fire_weather_indices (
+        location_id, date, consecutive_dry_days, precipitation_7d,
+        precipitation_30d, temp_max_7d, humidity_min_7d
+    )
+    VALUES %s
+    ON CONFLICT (location_id, date) DO UPDATE SET
+        consecutive_dry_days = EXCLUDED.consecutive_dry_days,
+        precipitation_7d = EXCLUDED.precipitation_7d,
+        precipitation_30d = EXCLUDED.precipitation_30d,
+        temp_max_7d = EXCLUDED.temp_max_7d,
+        humidity_min_7d = EXCLUDED.humidity_min_7d,
+        updated_at = CURRENT_TIMESTAMP;
+"""
+
+
+class RollingIndexState:
+    """
+    Rolling-window state carried from one day to the next.
+    Windows are calendar based, so missing days simply fall out of the window;
+    a missing day also ends a dry spell since it cannot be confirmed dry.
+    """
+
+    def __init__(self, consecutive_dry_days: int = 0, last_date: Optional[date] = None):
+        self.consecutive_dry_days = consecutive_dry_days
+        self.last_date = last_date
+        self._precipitation: Deque[Tuple[date, float]] = deque()
+        self._temp_max: Deque[Tuple[date, float]] = deque()
+        self._humidity: Deque[Tuple[date, float]] = deque()
+
+    @staticmethod
+    def _evict(window: Deque[Tuple[date, float]], current: date, days: int) -> None:
+        while window and window[0][0] <= current - timedelta(days=days):
+            window.popleft()
+
+    @staticmethod
+    def _push_extreme(window: Deque[Tuple[date, float]], day: date, value: float, keep_max: bool) -> None:
+        # Monotonic deque: the window extreme is always at the front
+        while window and (window[-1][1] <= value if keep_max else window[-1][1] >= value):
+            window.pop()
+        window.append((day, value))
+
+    def seed(self, row: Dict[str, Any]) -> None:
+        """Add a day that precedes the recomputed range to the windows only"""
+        day = row['date']
+        self._precipitation.append((day, float(row['precipitation'] or 0)))
+        self._push_extreme(self._temp_max, day, float(row['temp_max']), keep_max=True)
+        self._push_extreme(self._humidity, day, float(row['humidity']), keep_max=False)
+
+    def advance(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the next day in date order and return its rolling indices"""
+        day = row['date']
+        precipitation = float(row['precipitation'] or 0)
+
+        is_consecutive = self.last_date is not None and day - self.last_date == timedelta(days=1)
+        if precipitation < DRY_DAY_MAX_PRECIPITATION:
+            self.consecutive_dry_days = self.consecutive_dry_days + 1 if is_consecutive else 1
+        else:
+            self.consecutive_dry_days = 0
+        self.last_date = day
+
+        self.seed(row)
+        self._evict(self._precipitation, day, LONG_WINDOW_DAYS)
+        self._evict(self._temp_max, day, SHORT_WINDOW_DAYS)
+        self._evict(self._humidity, day, SHORT_WINDOW_DAYS)
+
+        short_start = day - timedelta(days=SHORT_WINDOW_DAYS)
+        return {
+            'date': day,
+            'consecutive_dry_days': self.consecutive_dry_days,
+            'precipitation_7d': round(sum(v for d, v in self._precipitation if d > short_start), 2),
+            'precipitation_30d': round(sum(v for _, v in self._precipitation), 2),
+            'temp_max_7d': self._temp_max[0][1],
+            'humidity_min_7d': self._humidity[0][1],
+        }
+
+
+def compute_indices(rows: Iterable[Dict[str, Any]], state: RollingIndexState) -> List[Dict[str, Any]]:
+    """Single ordered pass over daily rows, carrying `state` forward"""
+    return [state.advance(row) for row in rows]
+
+
+def _resume_start(new_dates: List[str], latest_indexed: date) -> date:
+    """
+    First day to recompute. Days after the latest indexed one are included
+    even when they are not new, so a batch whose update failed is
+    recomputed by the next ingestion instead of breaking the dry streak.
+    """
+    return min(min(date.fromisoformat(d) for d in new_dates), latest_indexed + timedelta(days=1))
+
+
+def _load_state(cur, location_id: int, start: date) -> RollingIndexState:
+    cur.execute(
+        """
+        SELECT date, consecutive_dry_days
+        FROM fire_weather_indices
+        WHERE location_id = %s AND date < %s
+        ORDER BY date DESC
+        LIMIT 1
+        """,
+        (location_id, start)
+    )
+    previous = cur.fetchone()
+    state = RollingIndexState()
+    if previous is not None:
+        state = RollingIndexState(previous['consecutive_dry_days'], previous['date'])
+
+    cur.execute(
+        """
+        SELECT date, temp_max, humidity, precipitation
+        FROM daily_weather
+        WHERE location_id = %s AND date >= %s AND date < %s
+        ORDER BY date
+        """,
+        (location_id, start - timedelta(days=LONG_WINDOW_DAYS - 1), start)
+    )
+    for row in cur.fetchall():
+        state.seed(row)
+    return state
+
+
+def _write_indices(cur, location_id: int, start: date, state: RollingIndexState) -> None:
+    """Recompute and upsert indices for one location from `start` onwards"""
+    cur.execute(
+        """
+        SELECT date, temp_max, humidity, precipitation
+        FROM daily_weather
+        WHERE location_id = %s AND date >= %s
+        ORDER BY date
+        """,
+        (location_id, start)
+    )
+    indices = compute_indices(cur.fetchall(), state)
+
+    execute_values(cur, upsert_indices_query, [
+        (
+            location_id,
+            row['date'],
+            row['consecutive_dry_days'],
+            row['precipitation_7d'],
+            row['precipitation_30d'],
+            row['temp_max_7d'],
+            row['humidity_min_7d'],
+        )
+        for row in indices
+    ])
+
+
+def update_fire_weather_indices(location_id: int, new_dates: List[str]) -> bool:
+    """
+    Compute rolling indices for newly ingested days of one location.
+    State is rebuilt from the previous index row and the last window of daily
+    rows, so only days from the earliest new (or not yet indexed) date onwards
+    are read and written.
+    The first run for a location computes its whole history in one pass.
+    """
+    if not new_dates:
+        return True
+
+    connection = get_connection()
+    try:
+        with connection.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                "SELECT MAX(date) AS latest FROM fire_weather_indices WHERE location_id = %s",
+                (location_id,)
+            )
+            latest_indexed = cur.fetchone()['latest']
+            if latest_indexed is not None:
+                start = _resume_start(new_dates, latest_indexed)
+                state = _load_state(cur, location_id, start)
+            else:
+                start = date.min
+                state = RollingIndexState()
+
+            _write_indices(cur, location_id, start, state)
+        connection.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Error updating fire weather indices: {e}")
+        connection.rollback()
+        return False
+    finally:
+        connection.close()
+
+
+def backfill_fire_weather_indices() -> bool:
+    """
+    Index the days that ingestion left without indices, e.g. a database
+    populated before indices existed or a batch whose update failed.
+    Each affected location resumes from its first unindexed day.
+    """
+    connection = get_connection()
+    try:
+        with connection.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                SELECT dw.location_id, MAX(dw.date) AS latest_daily
+                FROM daily_weather dw
+                GROUP BY dw.location_id
+                HAVING MAX(dw.date) > COALESCE(
+                    (SELECT MAX(date) FROM fire_weather_indices fwi WHERE fwi.location_id = dw.location_id),
+                    '-infinity'::date
+                )
+                """
+            )
+            stale = cur.fetchall()
+    finally:
+        connection.close()
+
+    ok = True
+    for row in stale:
+        if not update_fire_weather_indices(row['location_id'], [row['latest_daily'].isoformat()]):
+            ok = False
+    return ok
+
+
+def rebuild_fire_weather_indices() -> bool:
+    """Recompute indices for every location from its full history"""
+    connection = get_connection()
+    try:
+        with connection.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT DISTINCT location_id FROM daily_weather")
+            for row in cur.fetchall():
+                _write_indices(cur, row['location_id'], date.min, RollingIndexState())
+        connection.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Error rebuilding fire weather indices: {e}")
+        connection.rollback()
+        return False
+    finally:
+        connection.close()
@@ -0,0 +1,178 @@
+import bisect
+import heapq
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import psycopg2
+
+from src.database.connection import get_connection
+from src.services.data_version_service import get_location_set_version
+
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@dataclass(frozen=True)
+class Location:
+    location_id: int
+    city_name: str
+    latitude: float
+    longitude: float
+
+
+def _to_unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(distance_km: float) -> float:
+    return 2 * math.sin(min(math.pi, distance_km / EARTH_RADIUS_KM) / 2)
+
+
+class LocationIndex:
+    """
+    In-memory spatial index over locations.
+    A KD-tree on unit-sphere coordinates answers nearest and radius queries
+    (chord length is monotonic in great-circle distance); a latitude-sorted
+    list answers bounding box queries.
+    """
+
+    def __init__(self, locations: List[Location]):
+        self.locations = locations
+        self._points = [_to_unit_vector(loc.latitude, loc.longitude) for loc in locations]
+        self._root = self._build(list(range(len(locations))), 0)
+        self._by_latitude = sorted(range(len(locations)), key=lambda i: locations[i].latitude)
+        self._latitudes = [locations[i].latitude for i in self._by_latitude]
+
+    def _build(self, indices: List[int], depth: int):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self._points[i][axis])
+        middle = len(indices) // 2
+        return (
+            indices[middle],
+            axis,
+            self._build(indices[:middle], depth + 1),
+            self._build(indices[middle + 1:], depth + 1),
+        )
+
+    def _squared_chord(self, i: int, target: Tuple[float, float, float]) -> float:
+        return sum((a - b) ** 2 for a, b in zip(self._points[i], target))
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Tuple[Location, float]]:
+        """k nearest locations with their distance in km, closest first"""
+        target = _to_unit_vector(latitude, longitude)
+        best: List[Tuple[float, int]] = []  # max-heap of (-squared chord, index)
+
+        def visit(node):
+            if node is None:
+                return
+            index, axis, left, right = node
+            distance = self._squared_chord(index, target)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, index))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, index))
+
+            diff = target[axis] - self._points[index][axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(far)
+
+        visit(self._root)
+        return [
+            (self.locations[index], round(_chord_to_km(math.sqrt(-distance)), 2))
+            for distance, index in sorted(best, reverse=True)
+        ]
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[Location, float]]:
+        """Locations within radius_km with their distance in km, closest first"""
+        target = _to_unit_vector(latitude, longitude)
+        limit = _km_to_chord(radius_km) ** 2
+        found: List[Tuple[float, int]] = []
+
+        def visit(node):
+            if node is None:
+                return
+            index, axis, left, right = node
+            distance = self._squared_chord(index, target)
+            if distance <= limit:
+                found.append((distance, index))
+            diff = target[axis] - self._points[index][axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if diff * diff <= limit:
+                visit(far)
+
+        visit(self._root)
+        return [
+            (self.locations[index], round(_chord_to_km(math.sqrt(distance)), 2))
+            for distance, index in sorted(found)
+        ]
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[Location]:
+        """Locations inside a bounding box; min_lon > max_lon crosses the antimeridian"""
+        start = bisect.bisect_left(self._latitudes, min_lat)
+        end = bisect.bisect_right(self._latitudes, max_lat)
+        result = []
+        for i in self._by_latitude[start:end]:
+            lon = self.locations[i].longitude
+            inside = min_lon <= lon <= max_lon if min_lon <= max_lon else (lon >= min_lon or lon <= max_lon)
+            if inside:
+                result.append(self.locations[i])
+        return result
+
+
+_index: Optional[LocationIndex] = None
+_index_version: Optional[str] = None
+_index_lock = threading.Lock()
+
+
+def _load_locations() -> List[Location]:
+    connection = get_connection()
+    if connection is None:
+        raise psycopg2.OperationalError("Database connection failed")
+    try:
+        with connection.cursor() as cur:
+            cur.execute("SELECT location_id, city_name, latitude, longitude FROM locations")
+            return [
+                Location(location_id, city_name, float(latitude), float(longitude))
+                for location_id, city_name, latitude, longitude in cur.fetchall()
+            ]
+    finally:
+        connection.close()
+
+
+def get_location_index() -> LocationIndex:
+    """
+    Shared location index, rebuilt when locations are added or removed.
+    The location set version is read through the data version cache, so most
+    calls do not touch the database. Locations are loaded and indexed outside
+    the lock; only the swap is serialised, so readers never wait on the query.
+    """
+    global _index, _index_version
+
+    version = get_location_set_version()
+    index, seen_version = _index, _index_version
+    if index is not None and version is not None and version == seen_version:
+        return index
+
+    index = LocationIndex(_load_locations())
+    with _index_lock:
+        # Keep an index another caller swapped in while this one was loading
+        if _index is None or _index_version == seen_version:
+            _index = index
+            _index_version = version
+            logger.info(f"Rebuilt location index with {len(index.locations)} locations")
+        return _index
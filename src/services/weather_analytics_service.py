@@ -5,6 +5,26 @@ from typing import Optional
 from psycopg2.extras import RealDictCursor
 
 
+AGGREGATE_PARAMETERS = (
+    "temp_max", "temp_min", "humidity", "wind_speed", "wind_gust",
+    "precipitation", "uv_index", "cloud_cover", "dew",
+)
+
+# bucket name -> (SQL expression for the bucket start date, bucket length)
+AGGREGATE_BUCKETS = {
+    "day": ("dw.date", "1 day"),
+    "week": ("date_trunc('week', dw.date)::date", "1 week"),
+    "month": ("date_trunc('month', dw.date)::date", "1 month"),
+    # Meteorological seasons (DJF, MAM, JJA, SON); December starts the next winter
+    "season": ("(date_trunc('quarter', dw.date + INTERVAL '1 month') - INTERVAL '1 month')::date", "3 months"),
+    "year": ("date_trunc('year', dw.date)::date", "1 year"),
+}
+
+SEASON_NAMES = {12: "winter", 3: "spring", 6: "summer", 9: "autumn"}
+
+MAX_AGGREGATE_BUCKETS = 1000
+
+
 class WeatherAnalytics:
     def __init__(self, db_connection):
         self.conn = db_connection
@@ -62,7 +82,82 @@ class WeatherAnalytics:
             logging.error(f"Error getting average for {parameter}: {e}")
             raise
 
-    def validate_dates(self, start_date: str, end_date: str) -> bool:
+    def get_aggregates(self, city_name: str, parameter: str, bucket: str,
+                       start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       limit: int = MAX_AGGREGATE_BUCKETS, offset: int = 0) -> dict:
+        """
+        Get min/max/avg/sum of a parameter per time bucket in a single grouped query.
+        Buckets are returned oldest first; limit/offset page through long ranges.
+
+        Raises:
+            ValueError: If the parameter or bucket is not supported
+        """
+        if parameter not in AGGREGATE_PARAMETERS:
+            raise ValueError(f"Unsupported parameter: {parameter}")
+        if bucket not in AGGREGATE_BUCKETS:
+            raise ValueError(f"Unsupported bucket: {bucket}")
+        limit = max(1, min(limit, MAX_AGGREGATE_BUCKETS))
+        offset = max(0, offset)
+
+        bucket_expr, bucket_length = AGGREGATE_BUCKETS[bucket]
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                query = """
+                    SELECT
+                        {bucket_expr} AS bucket_start,
+                        MIN(dw.{param}) AS min_value,
+                        MAX(dw.{param}) AS max_value,
+                        AVG(dw.{param}) AS avg_value,
+                        SUM(dw.{param}) AS sum_value,
+                        COUNT(dw.{param}) AS day_count,
+                        COUNT(*) OVER () AS total_buckets
+                    FROM daily_weather dw
+                    JOIN locations l ON dw.location_id = l.location_id
+                    WHERE l.city_name = %s
+                """.format(bucket_expr=bucket_expr, param=parameter)
+
+                params = [city_name]
+
+                if start_date and end_date:
+                    query += " AND dw.date BETWEEN %s AND %s"
+                    params.extend([start_date, end_date])
+
+                query += " GROUP BY bucket_start ORDER BY bucket_start LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
+
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+            buckets = []
+            for row in rows:
+                bucket_start = row['bucket_start']
+                entry = {
+                    'bucket_start': bucket_start.strftime('%Y-%m-%d'),
+                    'min_value': float(row['min_value']) if row['min_value'] is not None else None,
+                    'max_value': float(row['max_value']) if row['max_value'] is not None else None,
+                    'avg_value': float(row['avg_value']) if row['avg_value'] is not None else None,
+                    'sum_value': float(row['sum_value']) if row['sum_value'] is not None else None,
+                    'day_count': row['day_count'],
+                }
+                if bucket == "season":
+                    entry['season'] = SEASON_NAMES[bucket_start.month]
+                buckets.append(entry)
+
+            return {
+                'bucket': bucket,
+                'bucket_length': bucket_length,
+                'total_buckets': rows[0]['total_buckets'] if rows else 0,
+                'limit': limit,
+                'offset': offset,
+                'buckets': buckets,
+            }
+
+        except Exception as e:
+            logging.error(f"Error getting aggregates for {parameter}: {e}")
+            raise
+
+    @staticmethod
+    def validate_dates(start_date: str, end_date: str) -> bool:
         """Validate date format and range"""
         try:
             start = datetime.strptime(start_date, '%Y-%m-%d')
@@ -1,19 +1,17 @@
 import json
 import logging
-import os
 import urllib.request
 from typing import Dict, Any
 
-from dotenv import load_dotenv
-
+from src.config import get_settings
 from src.database.connection import get_connection
+from src.services.climatology_service import update_baselines
+from src.services.data_version_service import bump_data_version, invalidate_data_versions
+from src.services.fire_weather_index_service import update_fire_weather_indices
 
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
-
 def insert_location(weather_data: Dict[str, Any]) -> int:
     connection = get_connection()
     try:
@@ -139,10 +137,26 @@ def insert_hourly_weather(daily_id: int, date: str,hours_data: list) -> bool:
         connection.close()
 
 
+def update_data_version(location_id: int) -> None:
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        bump_data_version(cursor, location_id)
+        connection.commit()
+    except Exception as e:
+        logger.error(f"Error updating data version: {e}")
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    invalidate_data_versions()
+
+
 def process_weather_data(weather_data: Dict[str, Any]) -> bool:
     try:
         location_id = insert_location(weather_data)
         logger.info(f"Processing data for location_id: {location_id}")
+        new_dates = []
 
         for day in weather_data['days']:
             daily_id, is_new_record = insert_daily_weather(location_id, day)
@@ -152,12 +166,20 @@ def process_weather_data(weather_data: Dict[str, Any]) -> bool:
                 continue
                 
             logger.info(f"Processing new daily weather for {day['datetime']}")
+            new_dates.append(day['datetime'])
             
             hourly_data = day['hours']
             
             if not insert_hourly_weather(daily_id,day['datetime'],hourly_data):
                 logger.error(f"Failed to insert hourly weather for {day['datetime']}")
 
+        if new_dates:
+            if not update_baselines(location_id, new_dates):
+                logger.error(f"Failed to update climatology baselines for location_id: {location_id}")
+            if not update_fire_weather_indices(location_id, new_dates):
+                logger.error(f"Failed to update fire weather indices for location_id: {location_id}")
+            update_data_version(location_id)
+
         return True
 
     except Exception as e:
@@ -167,8 +189,7 @@ def process_weather_data(weather_data: Dict[str, Any]) -> bool:
 
 def get_weather_data():
 
-    api_key = os.getenv("API_KEY_WEATHER")
-    # api_key = os.getenv("API_KEY_WEATHER2")
+    api_key = get_settings().weather_api_key
 
     url = f"https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline/Los%20angeles/last30days?unitGroup=metric&key={api_key}&contentType=json"
     try:
@@ -0,0 +1,123 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.services.fire_weather_index_service import (
+    DRY_DAY_MAX_PRECIPITATION,
+    LONG_WINDOW_DAYS,
+    SHORT_WINDOW_DAYS,
+    RollingIndexState,
+    _resume_start,
+    compute_indices,
+)
+
+
+def _make_rows(seed, days=120, gap_rate=0.05):
+    rnd = random.Random(seed)
+    rows = []
+    day = date(2024, 1, 1)
+    for _ in range(days):
+        if rnd.random() < gap_rate:
+            day += timedelta(days=rnd.randint(1, 3))
+        rows.append({
+            'date': day,
+            'temp_max': round(rnd.uniform(10, 40), 1),
+            'humidity': round(rnd.uniform(5, 90), 1),
+            # Mostly dry days so that long dry spells occur
+            'precipitation': rnd.choice([0, 0, 0, 0, 0.4, 2.5, 12.0, None]),
+        })
+        day += timedelta(days=1)
+    return rows
+
+
+def _brute_force(rows):
+    expected = []
+    for i, row in enumerate(rows):
+        day = row['date']
+
+        def window(days):
+            return [r for r in rows[:i + 1] if r['date'] > day - timedelta(days=days)]
+
+        dry_days = 0
+        for j in range(i, -1, -1):
+            if (rows[j]['precipitation'] or 0) >= DRY_DAY_MAX_PRECIPITATION:
+                break
+            if j < i and rows[j + 1]['date'] - rows[j]['date'] != timedelta(days=1):
+                break
+            dry_days += 1
+
+        expected.append({
+            'date': day,
+            'consecutive_dry_days': dry_days,
+            'precipitation_7d': round(sum(r['precipitation'] or 0 for r in window(SHORT_WINDOW_DAYS)), 2),
+            'precipitation_30d': round(sum(r['precipitation'] or 0 for r in window(LONG_WINDOW_DAYS)), 2),
+            'temp_max_7d': max(r['temp_max'] for r in window(SHORT_WINDOW_DAYS)),
+            'humidity_min_7d': min(r['humidity'] for r in window(SHORT_WINDOW_DAYS)),
+        })
+    return expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rolling_windows_match_brute_force(seed):
+    rows = _make_rows(seed)
+    assert compute_indices(rows, RollingIndexState()) == _brute_force(rows)
+
+
+def test_missing_day_ends_dry_spell():
+    rows = [
+        {'date': date(2024, 7, 1), 'temp_max': 30, 'humidity': 20, 'precipitation': 0},
+        {'date': date(2024, 7, 2), 'temp_max': 30, 'humidity': 20, 'precipitation': 0},
+        {'date': date(2024, 7, 4), 'temp_max': 30, 'humidity': 20, 'precipitation': 0},
+    ]
+    result = compute_indices(rows, RollingIndexState())
+    assert [r['consecutive_dry_days'] for r in result] == [1, 2, 1]
+
+
+def _resumed_state(rows, indexed, start):
+    """Mirrors _load_state: the last indexed row before start plus the preceding window of raw rows"""
+    previous = [row for row in indexed if row['date'] < start]
+    state = RollingIndexState()
+    if previous:
+        state = RollingIndexState(previous[-1]['consecutive_dry_days'], previous[-1]['date'])
+    for row in rows:
+        if start - timedelta(days=LONG_WINDOW_DAYS - 1) <= row['date'] < start:
+            state.seed(row)
+    return state
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("split", [1, 10, 45, 119])
+def test_incremental_resume_matches_full_pass(seed, split):
+    rows = _make_rows(seed)
+    full = compute_indices(rows, RollingIndexState())
+
+    start = rows[split]['date']
+    state = _resumed_state(rows, full[:split], start)
+    assert compute_indices(rows[split:], state) == full[split:]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_resume_after_failed_batch_recomputes_gap(seed):
+    rows = _make_rows(seed, gap_rate=0)
+    for row in rows[40:70]:
+        row['precipitation'] = 0
+    full = compute_indices(rows, RollingIndexState())
+
+    # Indices exist up to day 49; the batch for days 50-59 failed to index,
+    # and the next ingestion brings days 60 onwards
+    indexed = full[:50]
+    new_dates = [row['date'].isoformat() for row in rows[60:]]
+
+    start = _resume_start(new_dates, indexed[-1]['date'])
+    assert start == rows[50]['date']
+
+    state = _resumed_state(rows, indexed, start)
+    resumed = compute_indices([row for row in rows if row['date'] >= start], state)
+    assert resumed == full[50:]
+    assert resumed[19]['consecutive_dry_days'] == full[69]['consecutive_dry_days'] >= 30
+
+
+def test_resume_start_prefers_backfilled_dates():
+    assert _resume_start(['2024-03-01', '2024-01-15'], date(2024, 2, 1)) == date(2024, 1, 15)
+    assert _resume_start(['2024-03-01'], date(2024, 2, 1)) == date(2024, 2, 2)
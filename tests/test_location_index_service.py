@@ -0,0 +1,91 @@
+import math
+import random
+
+import pytest
+
+from src.services.location_index_service import EARTH_RADIUS_KM, Location, LocationIndex
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+@pytest.fixture(scope="module")
+def locations():
+    rnd = random.Random(1)
+    return [
+        Location(i, f"city-{i}", rnd.uniform(-89, 89), rnd.uniform(-180, 180))
+        for i in range(500)
+    ]
+
+
+@pytest.fixture(scope="module")
+def index(locations):
+    return LocationIndex(locations)
+
+
+def _queries(count=100):
+    rnd = random.Random(2)
+    return [(rnd.uniform(-90, 90), rnd.uniform(-180, 180), rnd.uniform(50, 3000)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_nearest_matches_brute_force(index, locations, k):
+    for latitude, longitude, _ in _queries():
+        expected = sorted(locations, key=lambda loc: _haversine_km(latitude, longitude, loc.latitude, loc.longitude))
+        result = index.nearest(latitude, longitude, k)
+
+        assert [loc.location_id for loc, _ in result] == [loc.location_id for loc in expected[:k]]
+        for loc, distance in result:
+            assert distance == pytest.approx(
+                _haversine_km(latitude, longitude, loc.latitude, loc.longitude), abs=0.01
+            )
+
+
+def test_within_radius_matches_brute_force(index, locations):
+    for latitude, longitude, radius_km in _queries():
+        expected = {
+            loc.location_id for loc in locations
+            if _haversine_km(latitude, longitude, loc.latitude, loc.longitude) <= radius_km
+        }
+        result = index.within_radius(latitude, longitude, radius_km)
+
+        assert {loc.location_id for loc, _ in result} == expected
+        assert [distance for _, distance in result] == sorted(distance for _, distance in result)
+
+
+def test_within_radius_across_antimeridian():
+    index = LocationIndex([Location(1, "east", 0.0, 179.5), Location(2, "west", 0.0, -179.5)])
+    result = index.within_radius(0.0, 180.0, 100)
+    assert {loc.location_id for loc, _ in result} == {1, 2}
+
+
+@pytest.mark.parametrize("bbox", [
+    (-10, -20, 10, 20),
+    (30, -125, 45, -110),
+    (-10, 170, 10, -170),
+    (-60, 150, 60, -150),
+    (-90, -180, 90, 180),
+])
+def test_within_bbox_matches_brute_force(index, locations, bbox):
+    min_lat, min_lon, max_lat, max_lon = bbox
+
+    def inside(loc):
+        if not min_lat <= loc.latitude <= max_lat:
+            return False
+        if min_lon <= max_lon:
+            return min_lon <= loc.longitude <= max_lon
+        return loc.longitude >= min_lon or loc.longitude <= max_lon
+
+    expected = {loc.location_id for loc in locations if inside(loc)}
+    assert {loc.location_id for loc in index.within_bbox(*bbox)} == expected
+
+
+def test_empty_index():
+    index = LocationIndex([])
+    assert index.nearest(0, 0, 3) == []
+    assert index.within_radius(0, 0, 1000) == []
+    assert index.within_bbox(-90, -180, 90, 180) == []